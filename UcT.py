@@ -7,19 +7,29 @@ import re
 import time
 import asyncio
 import aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import AsyncResolver, ThreadedResolver
+from yarl import URL
+import socket
+import ssl
 import concurrent.futures
+import multiprocessing
 from urllib.parse import urlparse
-from collections import defaultdict
+from collections import Counter, defaultdict, OrderedDict
 import zipfile
+import shelve
+import contextlib
 import io
-import math
+import csv
+import importlib.util
+import mmap
 from functools import lru_cache
 import unicodedata
-import string
 import base64
 import tempfile
 import traceback
 import threading
+import queue
 import webbrowser
 import pandas as pd
 from datetime import datetime
@@ -28,20 +38,104 @@ from datetime import datetime
 # UcT核心配置
 class UctConfig:
     MAX_WORKERS = 24  # 最大线程数(CPU核心数*3)
+    PROCESS_MIN_FILE_SIZE = 64 * 1024  # 达到该大小的文件交给进程池提取(字节)
+    MMAP_MIN_FILE_SIZE = 1024 * 1024  # 超过该大小的文件使用内存映射流式扫描(字节)
     MAX_ASYNC_TASKS = 256  # 异步任务最大并发数
+    MAX_CONNECTIONS_PER_HOST = 8  # 单个主机最大连接数
+    MAX_TASKS_PER_HOST = 4  # 单个主机同时验证的URL数
+    DNS_CACHE_TTL = 600  # DNS缓存时间(秒)
+    DNS_CACHE_SIZE = 4096  # 解析器缓存的主机数
+    DNS_TIMEOUT = 5  # 单个主机解析超时时间(秒)
     REQUEST_TIMEOUT = 10  # 请求超时时间(秒)
     USER_AGENT = "UcT/1.0 (Professional URL Checker)"  # 定制UA
     URL_REGEX = r'(https?://[^<\s\'"]{8,})'  # 高效URL识别正则
     CACHE_SIZE = 1024  # URL处理缓存大小
+    RESULT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.uct_cache')  # 跨会话验证结果缓存
+    RESULT_CACHE_TTL = 24 * 3600  # 验证结果缓存有效期(秒)
     CHUNK_SIZE = 50  # 批量结果处理块大小（提高效率）
+    STOP_POLL_INTERVAL = 0.1  # 验证过程中检查停止请求的间隔(秒)
+    # 添加文件夹时收集的文件类型（其余类型仍可通过"添加文件"单独加入）
+    SUPPORTED_EXTENSIONS = frozenset({
+        # 文档
+        '.txt', '.md', '.rst', '.tex', '.log', '.pdf', '.rtf',
+        '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.odt', '.ods', '.odp', '.epub',
+        # 网页与邮件
+        '.html', '.htm', '.xhtml', '.mht', '.mhtml', '.eml', '.svg',
+        # 数据与配置
+        '.xml', '.csv', '.tsv', '.json', '.jsonl', '.yaml', '.yml', '.toml',
+        '.ini', '.cfg', '.conf', '.properties', '.sql', '.ipynb',
+        # 源代码与脚本
+        '.js', '.mjs', '.ts', '.jsx', '.tsx', '.vue', '.css', '.scss',
+        '.py', '.java', '.kt', '.c', '.h', '.cpp', '.hpp', '.cs', '.go', '.rs',
+        '.php', '.rb', '.swift', '.sh', '.bat', '.ps1'
+    })
+    DRAIN_INTERVAL = 100  # 界面刷新结果队列的间隔(毫秒)
+    DRAIN_BATCH_SIZE = 500  # 每次刷新最多处理的结果数
+    REPORT_DELAY = 150  # 报告刷新防抖延迟(毫秒)
     REQUIRED_PACKAGES = [
         'aiohttp',
         'pandas',
         'PyMuPDF',  # PDF处理库
-        'openpyxl',
         'python-docx',
-        'python-pptx'
+        'python-pptx',
+        'pyarrow',  # Parquet/Feather导出
+        'xlsxwriter'  # Excel导出
     ]
+    # 包名与导入模块名不一致的依赖
+    PACKAGE_MODULES = {
+        'PyMuPDF': 'fitz',
+        'python-docx': 'docx',
+        'python-pptx': 'pptx'
+    }
+
+
+# 预编译URL正则（模块加载时编译一次）
+_URL_RE = re.compile(UctConfig.URL_REGEX)
+# 字节正则只用于定位候选：\s只认ASCII空白、长度按字节计，命中后解码再由str正则确认
+_URL_RE_BYTES = re.compile(UctConfig.URL_REGEX.encode())
+
+# 可选Hyperscan加速（SIMD扫描原始字节，未安装或平台不支持时回退到re）
+try:
+    import hyperscan
+
+    _HS_DB = hyperscan.Database()
+    # 定长前缀只在每个URL起点上报一次，完整长度再由字节正则确定
+    _HS_DB.compile(
+        expressions=[rb'https?://[^<\s\'"]{8}'],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+    )
+except Exception:
+    _HS_DB = None
+
+
+# UcT单条URL记录
+class UctUrlRecord:
+    """URL记录（__slots__省去每条记录一个dict的内存开销）"""
+    __slots__ = (
+        'original_url', 'normalized_url', 'source_file',
+        'status_code', 'status', 'emoji', 'response_time', 'error_message',
+        'display_url', 'display_source'
+    )
+
+    def __init__(self, original_url, normalized_url, source_file):
+        self.original_url = original_url
+        self.normalized_url = normalized_url
+        self.source_file = source_file
+        self.status_code = 0
+        self.status = "未知"
+        self.emoji = "❓"
+        self.response_time = 0
+        self.error_message = ""
+        # 表格中显示的截断文本，结果入表时生成
+        self.display_url = ""
+        self.display_source = ""
+
+    def copy(self, **changes):
+        """复制记录，可同时替换部分字段"""
+        record = UctUrlRecord.__new__(UctUrlRecord)
+        for name in self.__slots__:
+            setattr(record, name, changes.get(name, getattr(self, name)))
+        return record
 
 
 # 静默依赖管理器
@@ -50,24 +144,11 @@ class SilentDependencyManager:
     def check_and_install_dependencies():
         """静默检查并安装缺失的依赖库"""
         try:
-            # 获取已安装的包
-            installed = {}
-            try:
-                import pkg_resources
-                installed = {pkg.key for pkg in pkg_resources.working_set}
-            except:
-                # 如果pkg_resources不可用，使用其他方法
-                try:
-                    from importlib.metadata import distributions
-                    installed = {dist.metadata['Name'].lower() for dist in distributions()}
-                except:
-                    return False
-
-            # 检查哪些包缺失
+            # 按模块名逐个查找，无需像pkg_resources那样在启动时遍历所有已安装的包
             missing = []
             for package in UctConfig.REQUIRED_PACKAGES:
-                normalized_name = package.replace('-', '_').lower()
-                if normalized_name not in installed:
+                module_name = UctConfig.PACKAGE_MODULES.get(package, package.replace('-', '_'))
+                if importlib.util.find_spec(module_name) is None:
                     missing.append(package)
 
             if not missing:
@@ -96,7 +177,19 @@ class UctEngine:
         try:
             # URL预处理
             url = url.strip().rstrip('.,:;!?')
-            url = unicodedata.normalize('NFC', url)
+            # 纯ASCII的URL做NFC规范化是无操作，直接跳过
+            if not url.isascii():
+                url = unicodedata.normalize('NFC', url)
+
+            # 常见的http(s)://host/path直接切分，避免urlparse的开销
+            if url.startswith(('http://', 'https://')):
+                scheme, _, rest = url.partition('://')
+                # 与urlparse结果一致：去掉查询参数和片段
+                rest = rest.partition('?')[0].partition('#')[0]
+                netloc, slash, path = rest.partition('/')
+                # 非ASCII主机（需NFKC校验）、含方括号的主机和带;参数的路径仍交给urlparse处理
+                if netloc.isascii() and '[' not in netloc and ']' not in netloc and ';' not in path:
+                    return f"{scheme}://{netloc.lower()}{slash}{path}" if netloc else None
 
             # 添加协议（如果需要）
             if not url.startswith(('http://', 'https://')):
@@ -121,21 +214,33 @@ class UctEngine:
         except:
             return None
 
+    @staticmethod
+    def file_size(file_path):
+        """获取文件大小，无法访问时返回0"""
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0
+
     @staticmethod
     def extract_urls(file_path):
         """超高效URL提取算法"""
         file_ext = os.path.splitext(file_path)[1].lower()
 
         try:
+            # PDF文件特殊处理
+            if file_ext == '.pdf':
+                return UctEngine._extract_pdf_urls(file_path)
+
+            # 大文件内存映射后直接扫描字节，避免整文件读入和解码
+            elif UctEngine.file_size(file_path) > UctConfig.MMAP_MIN_FILE_SIZE:
+                return UctEngine._extract_mmap_urls(file_path)
+
             # 文本类文件使用统一处理方法
-            if file_ext in ('.txt', '.md', '.html', '.htm', '.xml', '.log'):
+            elif file_ext in ('.txt', '.md', '.html', '.htm', '.xml', '.log'):
                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                     return UctEngine._extract_text_urls(f.read(), file_path)
 
-            # PDF文件特殊处理
-            elif file_ext == '.pdf':
-                return UctEngine._extract_pdf_urls(file_path)
-
             # 其他文件类型使用通用二进制提取
             else:
                 with open(file_path, 'rb') as f:
@@ -154,16 +259,19 @@ class UctEngine:
             doc = fitz.open(file_path)
             urls = set()
 
+            # 默认文本选项去掉连字合成：连字处理对URL识别无用且耗CPU
+            text_flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
             for page in doc:
-                # 获取所有链接
-                links = page.get_links()
-                for link in links:
-                    if 'uri' in link:
-                        urls.add(link['uri'])
+                # 优先读取链接注释层
+                page_urls = {link['uri'] for link in page.get_links() if link.get('uri')}
+                if page_urls:
+                    urls |= page_urls
+                    continue
 
-                # 获取页面文本
-                text = page.get_text("text")
-                urls |= set(re.findall(UctConfig.URL_REGEX, text))
+                # 页面没有超链接时才提取文本，捕获正文中的纯文本URL
+                text = page.get_text("text", flags=text_flags)
+                urls |= set(_URL_RE.findall(text))
 
             doc.close()
             return UctEngine._normalize_urls(urls, file_path)
@@ -171,47 +279,79 @@ class UctEngine:
             print(f"PDF提取错误: {file_path} | {str(e)}")
             return []
 
+    @staticmethod
+    def _extract_mmap_urls(file_path):
+        """大文件URL提取：内存映射扫描，内存占用与文件大小无关"""
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 逐个解码并去重，内存只随不同URL的数量增长
+            urls = UctEngine._decode_urls(match.group(0) for match in _URL_RE_BYTES.finditer(mm))
+        return UctEngine._normalize_urls(urls, file_path)
+
     @staticmethod
     def _extract_text_urls(content, file_path):
         """文本文件URL提取优化"""
-        # 两种匹配策略
-        urls = set(re.findall(UctConfig.URL_REGEX, content))
+        if _HS_DB is not None:
+            urls = UctEngine._scan_hyperscan(content.encode('utf-8'))
+        else:
+            # 单遍线性扫描，结尾标点由normalize_url统一裁剪
+            urls = set(_URL_RE.findall(content))
+        return UctEngine._normalize_urls(urls, file_path)
+
+    @staticmethod
+    def _scan_hyperscan(content):
+        """Hyperscan扫描字节内容，返回URL集合"""
+        starts = []
+
+        def on_match(expr_id, start, end, flags, context):
+            starts.append(start)
+
+        _HS_DB.scan(content, match_event_handler=on_match)
+
+        # 与findall一致：跳过落在上一个URL内部的起点
+        matches = []
+        pos = 0
+        for start in sorted(starts):
+            if start < pos:
+                continue
+            match = _URL_RE_BYTES.match(content, start)
+            pos = match.end()
+            matches.append(match.group(0))
+        return UctEngine._decode_urls(matches)
 
-        # 第二遍匹配处理边界情况
-        alt_urls = set(re.findall(r'https?://[^<\s]{8,}[^\s>]', content))
+    @staticmethod
+    def _decode_urls(matches):
+        """解码字节正则命中的候选，再用str正则重新匹配
 
-        return UctEngine._normalize_urls(urls | alt_urls, file_path)
+        候选可能含str正则视为空白的非ASCII字符（NBSP、全角空格等），
+        且最短长度按字符计算，重新匹配后结果与直接扫描文本一致。
+        """
+        urls = set()
+        findall = _URL_RE.findall
+        for raw in matches:
+            urls.update(findall(raw.decode('utf-8', 'ignore')))
+        return urls
 
     @staticmethod
     def _extract_binary_urls(content, file_path):
         """通用二进制文件URL提取"""
-        try:
-            # 尝试解码为文本
-            try:
-                text = content.decode('utf-8')
-            except:
-                text = content.decode('latin-1', errors='ignore')
+        if _HS_DB is not None:
+            # 直接扫描原始字节，无需先解码
+            return UctEngine._normalize_urls(UctEngine._scan_hyperscan(content), file_path)
 
-            return UctEngine._extract_text_urls(text, file_path)
-        except:
-            # 使用正则扫描二进制内容
-            text = ''.join(chr(b) if b < 128 and chr(b) in string.printable else '.' for b in content)
-            urls = set(re.findall(UctConfig.URL_REGEX, text))
-            return UctEngine._normalize_urls(urls, file_path)
+        # 字节正则直接扫描原始内容，只解码命中的URL，省去整段解码和逐字节重建文本
+        urls = UctEngine._decode_urls(_URL_RE_BYTES.findall(content))
+        return UctEngine._normalize_urls(urls, file_path)
 
     @staticmethod
     def _normalize_urls(urls, file_path):
-        """URL标准化处理"""
-        results = []
+        """URL标准化处理（同一文件内规范化结果相同的URL只保留一条）"""
+        normalize = UctEngine.normalize_url
+        records = {}
         for url in urls:
-            norm_url = UctEngine.normalize_url(url)
-            if norm_url:
-                results.append({
-                    "original_url": url,
-                    "normalized_url": norm_url,
-                    "source_file": file_path
-                })
-        return results
+            norm_url = normalize(url)
+            if norm_url and norm_url not in records:
+                records[norm_url] = UctUrlRecord(url, norm_url, file_path)
+        return list(records.values())
 
     @staticmethod
     def extract_from_text(text, source_name="手动输入"):
@@ -219,138 +359,440 @@ class UctEngine:
         urls = set()
 
         # 使用高效的正则提取
-        matches = re.findall(UctConfig.URL_REGEX, text)
+        matches = _URL_RE.findall(text)
         for match in matches:
             norm_url = UctEngine.normalize_url(match)
             if norm_url:
                 urls.add(norm_url)
 
         # 准备结果格式
-        return [{
-            "original_url": url,
-            "normalized_url": url,
-            "source_file": source_name
-        } for url in urls]
+        return [UctUrlRecord(url, url, source_name) for url in urls]
+
+
+# DNS解析失败的异常类型（aiohttp 3.11起单独提供ClientConnectorDNSError）
+_DNS_ERRORS = (socket.gaierror,) + (
+    (aiohttp.ClientConnectorDNSError,) if hasattr(aiohttp, 'ClientConnectorDNSError') else ()
+)
+
+
+# 带LRU缓存的DNS解析器
+class UctCachingResolver(AbstractResolver):
+    """按(主机, 端口, 地址族)缓存解析结果，失败同样缓存，同一主机只解析一次"""
+
+    def __init__(self):
+        try:
+            # aiodns异步解析；未安装或Windows事件循环不支持时回退到线程池解析
+            self._resolver = AsyncResolver()
+        except Exception:
+            self._resolver = ThreadedResolver()
+        self._cache = OrderedDict()
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        key = (host, port, family)
+        future = self._cache.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._resolver.resolve(host, port, family))
+            self._cache[key] = future
+            if len(self._cache) > UctConfig.DNS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        # 并发请求共享同一次解析，单个请求被取消不影响其他等待者
+        return await asyncio.shield(future)
+
+    async def close(self):
+        await self._resolver.close()
 
 
 # UcT异步验证引擎
 class UctVerifier:
     @staticmethod
-    async def verify_urls(urls):
-        """异步批量验证URL"""
+    async def verify_urls(urls, on_batch=None, should_stop=None, cache=None):
+        """异步批量验证URL
+
+        每完成CHUNK_SIZE个结果调用一次on_batch(batch)，便于界面流式刷新；
+        should_stop()返回True时取消尚未完成的验证；
+        cache为跨会话的结果缓存（规范化URL -> 缓存条目），有效期内的URL不再请求。
+        """
         results = []
+
+        # 跨会话缓存中仍在有效期内的结果
+        now = time.time()
+        cached = {}
+        if cache is not None:
+            for url_info in urls:
+                entry = cache.get(url_info.normalized_url)
+                if entry is not None and now - entry[0] < UctConfig.RESULT_CACHE_TTL:
+                    cached[url_info.normalized_url] = entry
         semaphore = asyncio.Semaphore(min(UctConfig.MAX_ASYNC_TASKS, 100))
+        # 按主机限流，避免同一域名的大量URL触发限流或连接被拒
+        host_semaphores = defaultdict(lambda: asyncio.Semaphore(UctConfig.MAX_TASKS_PER_HOST))
+
+        # 整批共享一个会话：复用连接池、保持长连接并缓存DNS
+        resolver = UctCachingResolver()
+        connector = aiohttp.TCPConnector(
+            limit=UctConfig.MAX_ASYNC_TASKS,
+            limit_per_host=UctConfig.MAX_CONNECTIONS_PER_HOST,
+            resolver=resolver,
+            use_dns_cache=True,
+            ttl_dns_cache=UctConfig.DNS_CACHE_TTL,
+            ssl=False
+        )
+        headers = {'User-Agent': UctConfig.USER_AGENT}
+        timeout = aiohttp.ClientTimeout(total=UctConfig.REQUEST_TIMEOUT)
+
+        async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+            async def _check(url_info):
+                # 先取主机名额再取全局名额：排队等待同一主机的任务不占用全局并发
+                # 主机键直接切分得到，不会因畸形URL抛出异常
+                host = url_info.normalized_url.partition('://')[2].partition('/')[0]
+                async with host_semaphores[host], semaphore:
+                    # 同一主机的任务共享一次解析，无法解析的域名不再发起连接
+                    try:
+                        await UctVerifier._resolve_host(resolver, url_info.normalized_url)
+                    except asyncio.TimeoutError as e:
+                        return UctVerifier._handle_error(url_info, e)
+                    except Exception as e:
+                        return UctVerifier._handle_dns_error(url_info, e)
+
+                    return await UctVerifier._verify_url(url_info, session)
+
+            async def _verify(url_info):
+                key = url_info.normalized_url
+                entry = cached.get(key)
+                if entry is not None:
+                    return UctVerifier._apply_cache_entry(url_info, entry)
+
+                verified = await _check(url_info)
+                if cache is not None and UctVerifier.is_cacheable(verified.status_code):
+                    cache[key] = UctVerifier._make_cache_entry(verified)
+                return verified
+
+            # 一次性提交全部任务，仅由信号量限流：任一URL完成即有新URL补位，
+            # 不再被每批中最慢的URL拖住
+            tasks = [asyncio.create_task(_verify(url_info)) for url_info in urls]
+            batch = []
+
+            async def _watch_stop():
+                # 等待中的请求可能很久才完成，定时检查停止请求并立即取消剩余任务
+                while not should_stop():
+                    await asyncio.sleep(UctConfig.STOP_POLL_INTERVAL)
+                for task in tasks:
+                    task.cancel()
+
+            watcher = asyncio.create_task(_watch_stop()) if should_stop else None
 
-        async def _verify(url_info):
-            async with semaphore:
-                return await UctVerifier._verify_url(url_info)
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        result = await next_done
+                    except asyncio.CancelledError:
+                        # 任务被停止请求取消；其他来源的取消照常向上传递
+                        if should_stop and should_stop():
+                            break
+                        raise
+                    results.append(result)
+                    batch.append(result)
+
+                    if len(batch) >= UctConfig.CHUNK_SIZE:
+                        if on_batch:
+                            on_batch(batch)
+                        batch = []
+
+                    if should_stop and should_stop():
+                        break
+
+                # 停止时已完成但未满一批的结果同样交出
+                if on_batch and batch:
+                    on_batch(batch)
+            finally:
+                # 取消被中止的剩余任务，并等待其退出后再关闭会话
+                pending = tasks if watcher is None else tasks + [watcher]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # 外部传入的解析器不会随连接器关闭
+        await resolver.close()
+        return results
 
-        # 分批验证避免内存溢出
-        batch_size = UctConfig.CHUNK_SIZE
-        batches = math.ceil(len(urls) / batch_size)
+    @staticmethod
+    def is_cacheable(status_code):
+        """只缓存2xx/3xx结果：错误、限流(429)和5xx可能很快恢复，下次需重新检测"""
+        return 200 <= status_code < 400
 
-        for i in range(batches):
-            start_idx = i * batch_size
-            end_idx = min((i + 1) * batch_size, len(urls))
-            batch = urls[start_idx:end_idx]
+    @staticmethod
+    def _make_cache_entry(result):
+        """生成缓存条目：(验证时间, 状态码, 状态, 图标, 响应时间, 错误信息)"""
+        return (time.time(), result.status_code, result.status, result.emoji,
+                result.response_time, result.error_message)
 
-            tasks = [_verify(url_info) for url_info in batch]
-            batch_results = await asyncio.gather(*tasks)
-            results.extend(batch_results)
+    @staticmethod
+    def _apply_cache_entry(result, entry):
+        """将缓存条目写回记录"""
+        _, result.status_code, result.status, result.emoji, result.response_time, result.error_message = entry
+        return result
 
-        return results
+    @staticmethod
+    async def _resolve_host(resolver, url):
+        """解析URL的主机（超时抛出TimeoutError），无法提取主机时交给请求阶段处理"""
+        try:
+            parsed = URL(url)
+        except ValueError:
+            return
+        if parsed.raw_host and parsed.port:
+            # 地址族与TCPConnector默认值一致，解析结果可被连接直接复用
+            await asyncio.wait_for(
+                resolver.resolve(parsed.raw_host, parsed.port, family=socket.AF_UNSPEC),
+                UctConfig.DNS_TIMEOUT
+            )
 
     @staticmethod
-    async def _verify_url(url_info):
+    async def _verify_url(url_info, session):
         """验证单个URL"""
-        url = url_info['normalized_url']
-
-        result = {
-            **url_info,
-            "status_code": 0,
-            "status": "未知",
-            "emoji": "❓",
-            "response_time": 0,
-            "error_message": ""
-        }
+        url = url_info.normalized_url
+
+        # 记录自带默认状态，验证结果直接写回
+        result = url_info
 
         if not url:
-            result['status'] = "无效"
-            result['emoji'] = "❌"
-            result['error_message'] = "空URL"
+            result.status = "无效"
+            result.emoji = "❌"
+            result.error_message = "空URL"
             return result
 
         try:
-            # 准备请求参数
-            headers = {'User-Agent': UctConfig.USER_AGENT}
-            timeout = aiohttp.ClientTimeout(total=UctConfig.REQUEST_TIMEOUT)
             start_time = time.time()
 
-            # 使用异步请求
-            async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
-                # 尝试HEAD请求
-                try:
-                    async with session.head(url, allow_redirects=True, ssl=False) as response:
-                        status = response.status
-                        elapsed = time.time() - start_time
-                except:
-                    # 如果HEAD请求失败，尝试GET请求
-                    async with session.get(url, allow_redirects=True, ssl=False) as response:
-                        status = response.status
-                        elapsed = time.time() - start_time
+            # HEAD请求不跟随重定向：返回3xx已说明链接有效，无需再请求目标页
+            async with session.head(url, allow_redirects=False) as response:
+                status = response.status
+
+            # 仅在服务器明确不支持HEAD时改用GET；
+            # 超时、DNS、SSL等错误重试GET只会再付一次同样的代价，直接交给错误处理
+            if status in (405, 501):
+                async with session.get(url, allow_redirects=True) as response:
+                    status = response.status
+
+            elapsed = time.time() - start_time
 
             # 处理结果
             if status < 200:
-                result['status'] = "信息响应"
-                result['emoji'] = "ℹ️"
+                result.status = "信息响应"
+                result.emoji = "ℹ️"
             elif status < 300:
-                result['status'] = "活跃"
-                result['emoji'] = "✅"
+                result.status = "活跃"
+                result.emoji = "✅"
             elif status < 400:
-                result['status'] = "重定向"
-                result['emoji'] = "🔄"
+                result.status = "重定向"
+                result.emoji = "🔄"
             elif status < 500:
-                result['status'] = "客户端错误"
-                result['emoji'] = "⚠️"
+                result.status = "客户端错误"
+                result.emoji = "⚠️"
             else:
-                result['status'] = "服务器错误"
-                result['emoji'] = "❌"
+                result.status = "服务器错误"
+                result.emoji = "❌"
 
-            result['status_code'] = status
-            result['response_time'] = round(elapsed, 4)
+            result.status_code = status
+            result.response_time = round(elapsed, 4)
             return result
 
         except Exception as e:
             return UctVerifier._handle_error(result, e)
 
+    @staticmethod
+    def _handle_dns_error(result, exception):
+        """解析失败的URL直接记为域名错误"""
+        result.status = "域名错误"
+        result.emoji = "🌐"
+        result.error_message = f"{type(exception).__name__}: {str(exception)[:120]}"
+        return result
+
     @staticmethod
     def _handle_error(result, exception):
-        """错误处理统一入口"""
-        err = str(exception).lower()
-
-        if 'timed out' in err:
-            result['status'] = "超时"
-            result['emoji'] = "⌛"
-        elif 'cannot connect' in err:
-            result['status'] = "无法连接"
-            result['emoji'] = "🔌"
-        elif 'name not known' in err or 'gaierror' in err:
-            result['status'] = "域名错误"
-            result['emoji'] = "🌐"
-        elif 'ssl' in err or 'certificate' in err:
-            result['status'] = "SSL错误"
-            result['emoji'] = "🔒"
-        elif 'too many' in err:
-            result['status'] = "请求过多"
-            result['emoji'] = "🆘"
+        """错误处理统一入口（按异常类型分类，不依赖各版本的错误信息文本）"""
+        if isinstance(exception, asyncio.TimeoutError):
+            result.status = "超时"
+            result.emoji = "⌛"
+        elif isinstance(exception, _DNS_ERRORS) or isinstance(getattr(exception, 'os_error', None), socket.gaierror):
+            result.status = "域名错误"
+            result.emoji = "🌐"
+        elif isinstance(exception, (aiohttp.ClientConnectorCertificateError, aiohttp.ClientSSLError, ssl.SSLError)):
+            result.status = "SSL错误"
+            result.emoji = "🔒"
+        elif isinstance(exception, aiohttp.ClientConnectorError):
+            result.status = "无法连接"
+            result.emoji = "🔌"
+        elif isinstance(exception, aiohttp.TooManyRedirects):
+            result.status = "请求过多"
+            result.emoji = "🆘"
         else:
-            result['status'] = "网络错误"
-            result['emoji'] = "❌"
+            result.status = "网络错误"
+            result.emoji = "❌"
 
-        result['error_message'] = f"{type(exception).__name__}: {str(exception)[:120]}"
+        result.error_message = f"{type(exception).__name__}: {str(exception)[:120]}"
         return result
 
 
+# 报告中各状态的图标
+STATUS_EMOJI = {
+    "活跃": "✅",
+    "重定向": "🔄",
+    "客户端错误": "⚠️",
+    "服务器错误": "❌",
+    "超时": "⌛"
+}
+
+# 结果表格中各状态对应的行标签
+STATUS_TAG = {
+    "活跃": "success",
+    "客户端错误": "error",
+    "服务器错误": "error",
+    "超时": "warning"
+}
+
+
+# 结果表格窗口化渲染
+class UctVirtualTree:
+    """Treeview虚拟化：数据保存在rows列表中，只实例化可视区域内的行
+
+    每行的iid即其在rows中的下标；滚动条和鼠标滚轮由本类接管。
+    """
+    OVERSCAN = 5  # 可视区域之外额外渲染的行数
+    WHEEL_ROWS = 3  # 滚轮每格滚动的行数
+
+    def __init__(self, tree, scrollbar, rows, row_builder):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = rows
+        self.row_builder = row_builder
+        self.first = 0  # 视口首行在rows中的下标
+        self.selected_index = None
+        # 样式中的行高只是初值，首次渲染后按实际行测量（HiDPI、大字体时实际行更高）
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        self.header_height = self.row_height
+
+        scrollbar.configure(command=self.yview)
+        tree.bind("<Configure>", lambda event: self.render())
+        tree.bind("<<TreeviewSelect>>", self.on_select)
+        tree.bind("<MouseWheel>", self.on_wheel)
+        tree.bind("<Button-4>", lambda event: self.scroll_rows(-self.WHEEL_ROWS))
+        tree.bind("<Button-5>", lambda event: self.scroll_rows(self.WHEEL_ROWS))
+        # 键盘导航同样由本类接管，Treeview自身的视图不会滚进额外渲染的行
+        tree.bind("<Up>", lambda event: self.move_selection(-1))
+        tree.bind("<Down>", lambda event: self.move_selection(1))
+        tree.bind("<Prior>", lambda event: self.scroll_rows(-self.visible_rows()))
+        tree.bind("<Next>", lambda event: self.scroll_rows(self.visible_rows()))
+        tree.bind("<Home>", lambda event: self.scroll_rows(-len(self.rows)))
+        tree.bind("<End>", lambda event: self.scroll_rows(len(self.rows)))
+
+    def visible_rows(self):
+        """视口可容纳的行数（扣除表头）"""
+        return max(1, (self.tree.winfo_height() - self.header_height) // self.row_height)
+
+    def measure_rows(self):
+        """按视口首行的实际位置测量表头高度和行高，有变化时返回True"""
+        bbox = self.tree.bbox(str(self.first))
+        if not bbox or (bbox[1], bbox[3]) == (self.header_height, self.row_height):
+            return False
+        self.header_height, self.row_height = bbox[1], bbox[3]
+        return True
+
+    def render(self, remeasure=True):
+        """重建视口内的行，代价只与视口大小有关"""
+        tree = self.tree
+        visible = self.visible_rows()
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - visible))
+        last = min(total, self.first + visible + self.OVERSCAN)
+
+        tree.delete(*tree.get_children())
+        insert = tree.insert
+        for index in range(self.first, last):
+            values, tags = self.row_builder(self.rows[index])
+            insert("", "end", iid=str(index), values=values, tags=tags)
+        # Treeview自身的视图固定在顶部，与first保持一致
+        tree.yview_moveto(0)
+
+        # 行高与初值不同时可容纳的行数随之变化，按实测值重新渲染一次
+        if remeasure and last > self.first and self.measure_rows():
+            self.render(remeasure=False)
+            return
+
+        # 恢复仍在视口内的选中项
+        if self.selected_index is not None and self.first <= self.selected_index < last:
+            iid = str(self.selected_index)
+            tree.selection_set(iid)
+            tree.focus(iid)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def reset(self):
+        """数据源被清空或整体替换后回到顶部"""
+        self.first = 0
+        self.selected_index = None
+        self.render()
+
+    def scroll_rows(self, count):
+        self.first += count
+        self.render()
+        return "break"
+
+    def at_bottom(self):
+        """视口是否已显示到最后一行"""
+        return self.first + self.visible_rows() >= len(self.rows)
+
+    def move_selection(self, step):
+        """方向键移动选中行，必要时滚动视口使其可见"""
+        if not self.rows:
+            return "break"
+        if self.selected_index is None:
+            index = self.first
+        else:
+            index = max(0, min(self.selected_index + step, len(self.rows) - 1))
+        self.selected_index = index
+
+        visible = self.visible_rows()
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + visible:
+            self.first = index - visible + 1
+        self.render()
+        return "break"
+
+    def scroll_to_end(self):
+        self.first = len(self.rows)
+        self.render()
+
+    def yview(self, *args):
+        """滚动条回调"""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == 'scroll':
+            count = int(args[1])
+            if args[2] == 'pages':
+                count *= self.visible_rows()
+            self.scroll_rows(count)
+
+    def on_wheel(self, event):
+        if abs(event.delta) >= 120:
+            steps = -event.delta // 120
+        else:
+            steps = -1 if event.delta > 0 else 1
+        return self.scroll_rows(steps * self.WHEEL_ROWS)
+
+    def on_select(self, event):
+        # 选中行被滚出视口时选区会变空，此时保留原记录
+        selected = self.tree.selection()
+        if selected:
+            self.selected_index = int(selected[0])
+
+
 # UcT主界面
 class UctApp(tk.Tk):
     def __init__(self):
@@ -370,10 +812,21 @@ class UctApp(tk.Tk):
 
         # 结果数据
         self.urls = []
+        self.worker_error = None  # 后台线程中断时的异常，结束标记处理时显示
         self.results = []
+        self.status_counter = Counter()  # 各状态的结果数，随结果增删实时维护
         self.file_paths = []
         self.running = False
 
+        # 来源文件路径 -> 表格中显示的短名称，同一文件的URL共用一次计算
+        self.basename_cache = {}
+
+        # 后台线程产出的结果经队列交给主线程显示，None表示本轮处理结束
+        self.results_queue = queue.Queue()
+
+        # 待执行的报告刷新任务
+        self.report_job = None
+
         # 创建UI
         self.create_ui()
         self.update_idletasks()
@@ -389,6 +842,9 @@ class UctApp(tk.Tk):
         except:
             pass
 
+        # 定时刷新结果队列
+        self.after(UctConfig.DRAIN_INTERVAL, self.drain_results_queue)
+
     def get_icon_path(self):
         """创建临时图标文件"""
         icon_data = base64.b64decode(
@@ -553,10 +1009,14 @@ class UctApp(tk.Tk):
             self.results_tree.heading(col_name, text=col_name)
             self.results_tree.column(col_name, width=width, stretch=False)
 
-        # 滚动条
-        tree_scroll_y = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
+        # 配置标签样式
+        self.results_tree.tag_configure('success', foreground='#2ecc71')
+        self.results_tree.tag_configure('error', foreground='#e74c3c')
+        self.results_tree.tag_configure('warning', foreground='#f39c12')
+
+        # 滚动条（纵向滚动由窗口化渲染接管）
+        tree_scroll_y = ttk.Scrollbar(results_frame, orient=tk.VERTICAL)
         tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.results_tree.configure(yscrollcommand=tree_scroll_y.set)
 
         tree_scroll_x = ttk.Scrollbar(results_frame, orient=tk.HORIZONTAL, command=self.results_tree.xview)
         tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
@@ -565,6 +1025,9 @@ class UctApp(tk.Tk):
         self.results_tree.pack(fill=tk.BOTH, expand=True)
         self.results_tree.bind("<Double-1>", self.on_result_double_click)
 
+        # 只实例化可视区域内的行，self.results为数据源
+        self.results_view = UctVirtualTree(self.results_tree, tree_scroll_y, self.results, self.result_row)
+
         # 表格右键菜单
         self.tree_menu = tk.Menu(self, tearoff=0)
         self.tree_menu.add_command(label="打开链接", command=self.open_selected_url)
@@ -629,18 +1092,24 @@ class UctApp(tk.Tk):
 
     def add_folder(self):
         """添加文件夹"""
-        folder = filedialog.askdirectory(title="选择文件夹")
+        folder = filedialog.askdirectory(title="选择文件夹（只收集支持的文档、网页、数据和源代码文件）")
         if folder:
-            # 多线程收集文件
-            def collect_files():
-                files = []
-                for root, _, filenames in os.walk(folder):
-                    for fn in filenames:
-                        if '.' in fn and not fn.startswith('~'):  # 忽略临时文件
-                            files.append(os.path.join(root, fn))
-                return files
+            # 多线程收集文件：scandir的目录项自带类型信息，无需逐个stat
+            def scan(directory):
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                yield from scan(entry.path)
+                            elif (not entry.name.startswith('~')  # 忽略临时文件
+                                  and os.path.splitext(entry.name)[1].lower() in UctConfig.SUPPORTED_EXTENSIONS
+                                  and entry.is_file()):
+                                yield entry.path
+                except OSError:
+                    # 与os.walk一致：跳过无权限访问的目录
+                    return
 
-            threading.Thread(target=lambda: self.update_file_list(collect_files())).start()
+            threading.Thread(target=lambda: self.update_file_list(list(scan(folder)))).start()
 
     def update_file_list(self, files):
         """更新文件列表"""
@@ -686,6 +1155,7 @@ class UctApp(tk.Tk):
             self.running = True
             self.urls.clear()
             self.results.clear()
+            self.status_counter.clear()
 
             # UI更新
             self.start_btn.config(state=tk.DISABLED)
@@ -722,7 +1192,7 @@ class UctApp(tk.Tk):
             self.status_var.set("开始验证手动输入的URL...")
 
             # 清空结果树
-            self.results_tree.delete(*self.results_tree.get_children())
+            self.results_view.reset()
             self.report_text.config(state=tk.NORMAL)
             self.report_text.delete(1.0, tk.END)
             self.report_text.config(state=tk.DISABLED)
@@ -730,9 +1200,9 @@ class UctApp(tk.Tk):
             # 在后台线程中处理
             threading.Thread(target=self.verify_urls_only, daemon=True).start()
         else:
-            # 处理文件+手动输入
+            # 处理文件+手动输入（输入框只能在主线程读取，取出后交给后台线程）
+            input_text = self.url_input.get(1.0, tk.END).strip()
             if not self.file_paths:
-                input_text = self.url_input.get(1.0, tk.END).strip()
                 if not input_text:
                     messagebox.showinfo("提示", "请添加文档或文件夹，或输入URL")
                     return
@@ -744,6 +1214,7 @@ class UctApp(tk.Tk):
             self.running = True
             self.urls.clear()
             self.results.clear()
+            self.status_counter.clear()
 
             # UI更新
             self.start_btn.config(state=tk.DISABLED)
@@ -755,7 +1226,7 @@ class UctApp(tk.Tk):
                 self.file_list.insert(tk.END, f"● {os.path.basename(path)}")
 
             # 清空结果
-            self.results_tree.delete(*self.results_tree.get_children())
+            self.results_view.reset()
             self.report_text.config(state=tk.NORMAL)
             self.report_text.delete(1.0, tk.END)
             self.report_text.config(state=tk.DISABLED)
@@ -777,15 +1248,23 @@ class UctApp(tk.Tk):
             self.status_var.set("开始处理...")
 
             # 在后台线程中处理
-            threading.Thread(target=self.process_files, daemon=True).start()
+            threading.Thread(target=self.process_files, args=(input_text,), daemon=True).start()
 
     def verify_urls_only(self):
         """仅验证URL（不处理文件）"""
-        # 在事件循环中运行异步验证
-        asyncio.run(self.verify_urls_async())
+        try:
+            # 在事件循环中运行异步验证
+            asyncio.run(self.verify_urls_async())
+        except Exception as e:
+            self.record_worker_error(e)
+        finally:
+            # 通知主线程完成验证（出错时同样发送，界面才能退出运行状态）
+            self.results_queue.put(None)
 
-        # 完成验证
-        self.finish_validation()
+    def record_worker_error(self, error):
+        """记录后台线程的异常，由主线程在finish_validation中提示"""
+        traceback.print_exc()
+        self.worker_error = error
 
     def stop_validation(self):
         """停止检测"""
@@ -794,132 +1273,216 @@ class UctApp(tk.Tk):
             self.status_var.set("操作已停止")
             self.stop_btn.config(state=tk.DISABLED)
 
-    def process_files(self):
-        """处理文件"""
-        # 阶段1：提取URL
-        self.status_var.set("正在提取URL...")
+    def process_files(self, input_text):
+        """处理文件（后台线程）"""
+        try:
+            self.extract_and_verify(input_text)
+        except Exception as e:
+            self.record_worker_error(e)
+        finally:
+            # 通知主线程完成验证（出错或中途停止时同样发送，界面才能退出运行状态）
+            self.results_queue.put(None)
 
-        # 使用线程池并行处理文件
-        with concurrent.futures.ThreadPoolExecutor(max_workers=UctConfig.MAX_WORKERS) as executor:
-            futures = [executor.submit(UctEngine.extract_urls, fp) for fp in self.file_paths]
+    def extract_and_verify(self, input_text):
+        """提取文件和手动输入中的URL并验证（界面更新均经after交给主线程）"""
+        # 阶段1：提取URL
+        self.after(0, self.status_var.set, "正在提取URL...")
+
+        # CPU密集的大文件交给进程池以绕开GIL真正并行，小文件留在线程池省去进程间开销
+        # max_workers=None按CPU数创建进程并遵守平台上限（Windows最多61个）；
+        # 统一用spawn启动，避免在Tk和线程池运行时从子线程fork进程
+        total = len(self.file_paths)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=UctConfig.MAX_WORKERS) as thread_pool, \
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=None,
+                    mp_context=multiprocessing.get_context('spawn')
+                ) as process_pool:
+            futures = []
+            for fp in self.file_paths:
+                if UctEngine.file_size(fp) >= UctConfig.PROCESS_MIN_FILE_SIZE:
+                    futures.append(process_pool.submit(UctEngine.extract_urls, fp))
+                else:
+                    futures.append(thread_pool.submit(UctEngine.extract_urls, fp))
 
             for i, future in enumerate(concurrent.futures.as_completed(futures)):
                 if not self.running:
+                    # 取消尚未开始的提取任务
+                    for pending in futures:
+                        pending.cancel()
                     break
 
-                urls = future.result()
+                try:
+                    urls = future.result()
+                except Exception as e:
+                    # 进程池工作进程异常退出等情况
+                    print(f"提取错误: {str(e)}")
+                    urls = []
+
                 if urls:
                     self.urls.extend(urls)
                     self.stats["urls_found"] += len(urls)
-                    self.stats_vars["URL发现"].set(str(self.stats["urls_found"]))
 
-                # 更新进度
-                progress = (i + 1) / len(self.file_paths) * 50
-                self.progress_var.set(progress)
-                self.status_var.set(f"文件处理中 {i + 1}/{len(self.file_paths)}")
+                # 更新进度（Tk控件只能在主线程操作）
+                self.after(0, self.update_extract_progress, i + 1, total, self.stats["urls_found"])
 
-        # 添加手动输入的URL
-        if self.running:
-            input_text = self.url_input.get(1.0, tk.END).strip()
-            if input_text:
-                manual_urls = UctEngine.extract_from_text(input_text)
-                if manual_urls:
-                    self.urls.extend(manual_urls)
-                    self.stats["urls_found"] += len(manual_urls)
-                    self.stats_vars["URL发现"].set(str(self.stats["urls_found"]))
-                    self.status_var.set(f"添加了 {len(manual_urls)} 个手动输入的URL")
+        # 添加手动输入的URL（排在已提交的进度更新之后执行，计数不会被覆盖）
+        if self.running and input_text:
+            manual_urls = UctEngine.extract_from_text(input_text)
+            if manual_urls:
+                self.urls.extend(manual_urls)
+                self.stats["urls_found"] += len(manual_urls)
+                self.after(0, self.stats_vars["URL发现"].set, str(self.stats["urls_found"]))
+                self.after(0, self.status_var.set, f"添加了 {len(manual_urls)} 个手动输入的URL")
 
         # 如果被停止或没有找到URL
         if not self.running or not self.urls:
-            self.finish_validation()
             return
 
         # 阶段2：验证URL
-        self.status_var.set("正在验证URL...")
+        self.after(0, self.status_var.set, "正在验证URL...")
 
         # 在事件循环中运行异步验证
         asyncio.run(self.verify_urls_async())
 
-        # 完成验证
-        self.finish_validation()
+    def update_extract_progress(self, done, total, urls_found):
+        """刷新URL提取阶段的进度"""
+        self.stats_vars["URL发现"].set(str(urls_found))
+        self.progress_var.set(done / total * 50)
+        self.status_var.set(f"文件处理中 {done}/{total}")
 
     async def verify_urls_async(self):
         """异步验证URL"""
-        # 批量处理URL验证
-        results = await UctVerifier.verify_urls(self.urls)
-
-        # 分批更新UI，避免界面冻结
-        batch_size = UctConfig.CHUNK_SIZE
-        total = len(results)
-
-        for i in range(0, total, batch_size):
-            if not self.running:
-                break
-
-            batch = results[i:i + batch_size]
-            self.process_results_batch(batch)
-
-            # 更新进度
-            if self.stats["files"] > 0:
-                # 文件+输入混合模式
-                progress = 50 + (i / total * 50)
-            else:
-                # 纯手动输入模式
-                progress = (i / total * 100)
+        # 同一URL常出现在多个文件中（页脚、模板链接），全局去重后每个URL只请求一次
+        sources = {}
+        for url_info in self.urls:
+            sources.setdefault(url_info.normalized_url, []).append(url_info)
+        unique_urls = [url_infos[0] for url_infos in sources.values()]
+
+        def on_batch(batch):
+            # 验证结果分发到该URL的每个来源，边完成边入队由主线程定时取出显示
+            for result in batch:
+                for url_info in sources[result.normalized_url]:
+                    self.results_queue.put(result.copy(
+                        original_url=url_info.original_url,
+                        source_file=url_info.source_file
+                    ))
+
+        with self.open_result_cache() as cache:
+            await UctVerifier.verify_urls(
+                unique_urls,
+                on_batch=on_batch,
+                should_stop=lambda: not self.running,
+                cache=cache
+            )
 
-            self.progress_var.set(min(progress, 100))
-            self.stats_vars["已验证"].set(str(self.stats["urls_verified"]))
+    def open_result_cache(self):
+        """打开跨会话的验证结果缓存，不可用时退回仅本轮有效的内存缓存"""
+        try:
+            cache = shelve.open(UctConfig.RESULT_CACHE_FILE)
+        except Exception as e:
+            print(f"结果缓存不可用: {str(e)}")
+            return contextlib.nullcontext({})
 
-            # 避免过于频繁的更新
-            time.sleep(0.05)
+        # 清理过期及不应缓存的条目，避免缓存文件无限增长
+        try:
+            now = time.time()
+            stale = [
+                key for key, entry in cache.items()
+                if now - entry[0] >= UctConfig.RESULT_CACHE_TTL or not UctVerifier.is_cacheable(entry[1])
+            ]
+            for key in stale:
+                del cache[key]
+        except Exception as e:
+            cache.close()
+            print(f"结果缓存不可用: {str(e)}")
+            return contextlib.nullcontext({})
+        return cache
+
+    def drain_results_queue(self):
+        """在主线程中批量取出验证结果并刷新界面"""
+        # 先安排下一次取出：本次处理出错也不会让队列从此无人读取
+        self.after(UctConfig.DRAIN_INTERVAL, self.drain_results_queue)
+
+        batch = []
+        finished = False
+        try:
+            while len(batch) < UctConfig.DRAIN_BATCH_SIZE:
+                result = self.results_queue.get_nowait()
+                if result is None:
+                    finished = True
+                    break
+                batch.append(result)
+        except queue.Empty:
+            pass
 
-        # 保存最终结果
-        self.results = results
+        try:
+            if batch:
+                self.process_results_batch(batch)
+                self.results_tree.update_idletasks()
+        finally:
+            # 结束标记之前的结果都已显示，再生成报告；显示出错也要结束本轮检测
+            if finished:
+                self.finish_validation()
 
     def process_results_batch(self, batch):
         """处理一批结果"""
+        # 截断后的显示文本只生成一次，视口重绘时直接读取
+        for res in batch:
+            url = res.normalized_url
+            res.display_url = url if len(url) <= 100 else url[:100] + '...'
+            res.display_source = self.short_source(res.source_file)
+
+        # 追加前记录视口是否在底部，用户向上翻看时不强制滚动
+        follow = self.results_view.at_bottom()
+        self.results.extend(batch)
+        self.status_counter.update(res.status for res in batch)
+
         # 更新统计
         self.stats["urls_verified"] += len(batch)
         self.stats["success_count"] += sum(
             1 for res in batch
-            if res.get('status') in ("活跃", "重定向")
+            if res.status in ("活跃", "重定向")
         )
 
         # 更新成功计数
         self.stats_vars["有效链接"].set(str(self.stats["success_count"]))
 
-        # 添加结果到Treeview
-        for result in batch:
-            self.add_result_to_tree(result)
-
-        # 添加后自动滚动到底部
-        self.results_tree.yview_moveto(1.0)
-
-    def add_result_to_tree(self, result):
-        """添加结果到Treeview"""
-        tags = ""
-        if result['status'] == "活跃":
-            tags = "success"
-        elif result['status'] in ("客户端错误", "服务器错误"):
-            tags = "error"
-        elif result['status'] == "超时":
-            tags = "warning"
-
-        # 添加行到Treeview
-        self.results_tree.insert("", "end", values=(
-            result.get('emoji', '❓'),
-            result['normalized_url'][:100] + ('...' if len(result['normalized_url']) > 100 else ''),
-            result.get('status_code', 'N/A'),
-            f"{result.get('response_time', 0):.3f}s",
-            os.path.basename(result['source_file']) if len(result['source_file']) < 30 else result['source_file'][:27] + "..."
-        ), tags=(tags,))
-
-        # 配置标签样式（只需一次）
-        if not hasattr(self, 'tags_configured'):
-            self.results_tree.tag_configure('success', foreground='#2ecc71')
-            self.results_tree.tag_configure('error', foreground='#e74c3c')
-            self.results_tree.tag_configure('warning', foreground='#f39c12')
-            self.tags_configured = True
+        # 数据已追加到self.results，整批只重绘一次视口
+        if follow:
+            self.results_view.scroll_to_end()
+        else:
+            self.results_view.render()
+
+        # 更新进度
+        total = max(len(self.urls), 1)
+        if self.stats["files"] > 0:
+            # 文件+输入混合模式
+            progress = 50 + (self.stats["urls_verified"] / total * 50)
+        else:
+            # 纯手动输入模式
+            progress = (self.stats["urls_verified"] / total * 100)
+
+        self.progress_var.set(min(progress, 100))
+        self.stats_vars["已验证"].set(str(self.stats["urls_verified"]))
+
+    def short_source(self, path):
+        """来源文件的显示名称（按路径缓存）"""
+        name = self.basename_cache.get(path)
+        if name is None:
+            name = os.path.basename(path) if len(path) < 30 else path[:27] + "..."
+            self.basename_cache[path] = name
+        return name
+
+    def result_row(self, result):
+        """生成结果在Treeview中的行数据：(列值, 标签)"""
+        values = (
+            result.emoji,
+            result.display_url,
+            result.status_code,
+            f"{result.response_time:.3f}s",
+            result.display_source
+        )
+        return values, (STATUS_TAG.get(result.status, ""),)
 
     def finish_validation(self):
         """完成验证过程"""
@@ -943,44 +1506,55 @@ class UctApp(tk.Tk):
         # 生成报告
         self.generate_report()
 
+        # 后台线程异常中断时提示用户
+        if self.worker_error is not None:
+            error, self.worker_error = self.worker_error, None
+            self.status_var.set("检测出错，已中止")
+            messagebox.showerror("检测错误", f"检测过程中出错: {type(error).__name__}: {str(error)}")
+
+    def schedule_report(self):
+        """防抖刷新报告：REPORT_DELAY内的多次请求只执行最后一次"""
+        if self.report_job:
+            self.after_cancel(self.report_job)
+        self.report_job = self.after(UctConfig.REPORT_DELAY, self.generate_report)
+
     def generate_report(self):
         """生成分析报告"""
+        # 直接调用时取消尚未执行的防抖任务
+        if self.report_job:
+            self.after_cancel(self.report_job)
+            self.report_job = None
+
         if not self.results:
             return
 
-        # 收集统计信息
-        report = "UcT 检测报告\n"
-        report += "=" * 50 + "\n\n"
-        report += f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += f"处理文件: {self.stats['files']} 个\n"
-        report += f"发现链接: {self.stats['urls_found']} 个\n"
-        report += f"验证链接: {self.stats['urls_verified']} 个\n"
-        report += f"有效链接: {self.stats['success_count']} 个 (成功率: {self.stats['success_count'] / max(self.stats['urls_verified'], 1) * 100:.1f}%)\n"
-        report += f"耗时: {self.stats_vars['时间'].get()}\n\n"
-
-        # 状态分布
-        status_stats = defaultdict(int)
-        for res in self.results:
-            status_stats[res['status']] += 1
+        # 收集统计信息（分段收集后一次拼接）
+        parts = [
+            "UcT 检测报告\n",
+            "=" * 50 + "\n\n",
+            f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"处理文件: {self.stats['files']} 个\n",
+            f"发现链接: {self.stats['urls_found']} 个\n",
+            f"验证链接: {self.stats['urls_verified']} 个\n",
+            f"有效链接: {self.stats['success_count']} 个 (成功率: {self.stats['success_count'] / max(self.stats['urls_verified'], 1) * 100:.1f}%)\n",
+            f"耗时: {self.stats_vars['时间'].get()}\n\n"
+        ]
 
+        # 状态分布（由status_counter实时维护，无需遍历全部结果）
+        status_stats = +self.status_counter
         if status_stats:
-            report += "状态分布:\n"
-            report += "--------\n"
-            for status, count in sorted(status_stats.items(), key=lambda x: x[1], reverse=True):
-                emoji = {
-                    "活跃": "✅",
-                    "重定向": "🔄",
-                    "客户端错误": "⚠️",
-                    "服务器错误": "❌",
-                    "超时": "⌛"
-                }.get(status, " ")
-                report += f"{emoji} {status:<12} {count} 个\n"
-            report += "\n"
-
-        # 更新报告文本框
+            parts.append("状态分布:\n")
+            parts.append("--------\n")
+            for status, count in status_stats.most_common():
+                emoji = STATUS_EMOJI.get(status, " ")
+                parts.append(f"{emoji} {status:<12} {count} 个\n")
+            parts.append("\n")
+
+        report = "".join(parts)
+
+        # 更新报告文本框（replace一次完成删除和插入）
         self.report_text.config(state=tk.NORMAL)
-        self.report_text.delete(1.0, tk.END)
-        self.report_text.insert(tk.END, report)
+        self.report_text.replace(1.0, tk.END, report)
         self.report_text.config(state=tk.DISABLED)
 
     def export_results(self):
@@ -990,41 +1564,89 @@ class UctApp(tk.Tk):
 
         file_path = filedialog.asksaveasfilename(
             title="导出检测结果",
-            filetypes=[("CSV文件", "*.csv"), ("Excel文件", "*.xlsx")],
-            defaultextension=".csv"
+            filetypes=[
+                ("Parquet文件", "*.parquet"),
+                ("Feather文件", "*.feather"),
+                ("CSV文件", "*.csv"),
+                ("Excel文件", "*.xlsx")
+            ],
+            defaultextension=".parquet"
         )
 
         if not file_path:
             return
 
+        # 写文件可能耗时较长，交给后台线程；传入结果快照，导出期间的删除不影响写出
+        self.export_btn.config(state=tk.DISABLED)
+        self.status_var.set(f"正在导出: {os.path.basename(file_path)}")
+        threading.Thread(
+            target=self.do_export,
+            args=(file_path, list(self.results)),
+            daemon=True
+        ).start()
+
+    def do_export(self, file_path, results):
+        """在后台线程中写出结果文件，完成后回到主线程提示"""
         try:
-            # 准备数据
-            data = []
-            for res in self.results:
-                data.append({
-                    "URL": res['normalized_url'],
-                    "状态": res['status'],
-                    "状态码": res.get('status_code', ''),
-                    "响应时间": res.get('response_time', ''),
-                    "错误信息": res.get('error_message', ''),
-                    "来源文件": res['source_file']
-                })
-
-            df = pd.DataFrame(data)
-
-            # 保存为CSV
+            # 保存为CSV：逐行流式写出，无需先在内存中构建整个DataFrame
+            # 1MB写缓冲减少系统调用次数
             if file_path.endswith('.csv'):
-                df.to_csv(file_path, index=False, encoding='utf-8-sig')
-
-            # 保存为Excel
+                with open(file_path, 'w', buffering=1 << 20, encoding='utf-8-sig', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["URL", "状态", "状态码", "响应时间", "错误信息", "来源文件"])
+                    writer.writerows(
+                        (res.normalized_url, res.status, res.status_code,
+                         res.response_time, res.error_message, res.source_file)
+                        for res in results
+                    )
+
+            # 保存为Parquet（体积最小）
+            elif file_path.endswith('.parquet'):
+                self.results_frame(results).to_parquet(file_path, compression='zstd', index=False)
+
+            # 保存为Feather（读取最快）
+            elif file_path.endswith('.feather'):
+                self.results_frame(results).to_feather(file_path, compression='zstd')
+
+            # 保存为Excel（兼容性最好，但写入远慢于其他格式）
+            # pandas按列写入单元格，不能使用xlsxwriter的constant_memory模式（已写出的行会被忽略）
             elif file_path.endswith('.xlsx'):
-                df.to_excel(file_path, index=False)
+                self.results_frame(results).to_excel(file_path, index=False, engine='xlsxwriter')
 
+        except Exception as e:
+            self.after(0, self.finish_export, file_path, e)
+        else:
+            self.after(0, self.finish_export, file_path, None)
+
+    def finish_export(self, file_path, error):
+        """导出结束后更新界面（主线程）"""
+        # 导出期间若已开始新一轮检测，导出按钮由检测流程恢复
+        if not self.running:
+            self.export_btn.config(state=tk.NORMAL)
+        if error is None:
             self.status_var.set(f"结果已导出: {os.path.basename(file_path)}")
             messagebox.showinfo("导出成功", f"结果已保存到:\n{file_path}")
-
-        except Exception as e:
-            messagebox.showerror("导出错误", f"导出失败: {str(e)}")
+        else:
+            self.status_var.set("导出失败")
+            messagebox.showerror("导出错误", f"导出失败: {str(error)}")
+
+    def results_frame(self, results):
+        """按列直接构建结果DataFrame，省去逐条生成的中间dict"""
+        df = pd.DataFrame({
+            "URL": [res.normalized_url for res in results],
+            "状态": [res.status for res in results],
+            "状态码": [res.status_code for res in results],
+            "响应时间": [res.response_time for res in results],
+            "错误信息": [res.error_message for res in results],
+            "来源文件": [res.source_file for res in results]
+        })
+
+        # 压缩列类型：状态码和耗时用窄数值类型，取值重复度高的列用分类类型
+        df["状态码"] = pd.to_numeric(df["状态码"], errors='coerce').astype('Int16')
+        df["响应时间"] = df["响应时间"].astype('float32')
+        df["状态"] = df["状态"].astype('category')
+        df["来源文件"] = df["来源文件"].astype('category')
+        return df
 
     def on_result_double_click(self, event):
         """双击打开URL"""
@@ -1035,24 +1657,21 @@ class UctApp(tk.Tk):
         if self.results_tree.identify_row(event.y) and self.results_tree.selection():
             self.tree_menu.post(event.x_root, event.y_root)
 
-    def open_selected_url(self):
-        """打开选中的URL"""
+    def current_full_url(self):
+        """当前选中行的完整URL（显示列已被截断），无选中项时返回None"""
         selected = self.results_tree.selection()
         if not selected:
-            return
-
-        item = self.results_tree.focus()
-        values = self.results_tree.item(item, 'values')
-        if not values or len(values) < 2:
-            return
-
-        url = values[1]  # 第二列是URL
-        if not url.startswith('http'):
-            return
+            return None
 
-        # 查找完整URL
-        full_url = next((r['normalized_url'] for r in self.results if r['normalized_url'].startswith(url)), "")
+        # iid即该行在self.results中的下标
+        index = int(self.results_tree.focus() or selected[0])
+        if index < len(self.results):
+            return self.results[index].normalized_url
+        return None
 
+    def open_selected_url(self):
+        """打开选中的URL"""
+        full_url = self.current_full_url()
         if full_url:
             try:
                 webbrowser.open(full_url)
@@ -1062,20 +1681,7 @@ class UctApp(tk.Tk):
 
     def copy_selected_url(self):
         """复制选中的URL"""
-        selected = self.results_tree.selection()
-        if not selected:
-            return
-
-        item = self.results_tree.focus()
-        values = self.results_tree.item(item, 'values')
-        if not values or len(values) < 2:
-            return
-
-        url = values[1]  # 第二列是URL
-
-        # 查找完整URL
-        full_url = next((r['normalized_url'] for r in self.results if r['normalized_url'].startswith(url)), "")
-
+        full_url = self.current_full_url()
         if full_url:
             try:
                 self.clipboard_clear()
@@ -1090,22 +1696,24 @@ class UctApp(tk.Tk):
         if not selected:
             return
 
-        # 从Treeview删除
-        for item in selected:
-            self.results_tree.delete(item)
-
-        # 更新结果列表
-        self.results = [res for res in self.results if res['normalized_url'] not in
-                        [self.results_tree.item(item, 'values')[1] for item in selected]]
+        # 行的iid即其在self.results中的下标，原地更新数据源后重绘视口
+        removed = {int(item) for item in selected}
+        self.status_counter.subtract(self.results[index].status for index in removed)
+        self.results[:] = [res for index, res in enumerate(self.results) if index not in removed]
+        self.results_view.selected_index = None
+        self.results_view.render()
 
         self.status_var.set(f"已删除 {len(selected)} 个结果项")
 
-        # 重新生成报告
-        self.generate_report()
+        # 重新生成报告（连续删除时只刷新一次）
+        self.schedule_report()
 
 
 def main():
     """主入口函数"""
+    # 打包为可执行文件时，进程池的子进程需要此调用
+    multiprocessing.freeze_support()
+
     # 静默检查并安装依赖
     if not SilentDependencyManager.check_and_install_dependencies():
         messagebox.showerror(